@@ -222,6 +222,23 @@ install_curl() {
     fi
 }
 
+# Function to install optional Python accelerators used by message_processor.py
+install_python_speedups() {
+    local packages=(isal pybase64 orjson zstandard xxhash)
+    
+    if ! command_exists python3; then
+        print_status "WARNING" "python3 not found, skipping optional message processor speedups"
+        return 0
+    fi
+    
+    print_status "INFO" "Installing optional Python speedups: ${packages[*]}"
+    if python3 -m pip install --user --quiet "${packages[@]}"; then
+        print_status "SUCCESS" "Python speedups installed"
+    else
+        print_status "WARNING" "Could not install Python speedups; message_processor.py will fall back to the standard library"
+    fi
+}
+
 # Main installation process
 main() {
     print_status "INFO" "Starting dependency installation..."
@@ -259,6 +276,7 @@ main() {
     install_terraform
     install_aws_cli
     install_jq
+    install_python_speedups
     
     print_status "SUCCESS" "All dependencies installed successfully!"
     
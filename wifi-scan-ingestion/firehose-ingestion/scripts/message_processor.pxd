@@ -0,0 +1,45 @@
+# Cython declarations for message_processor.py (pure Python mode).
+# Only used when the module is compiled via `ENABLE_SPEEDUPS=1 python3 setup.py build_ext --inplace`;
+# keep in sync with the attributes and hot-path methods of WifiScanMessageProcessor.
+# Buffer parameters stay `object` so the compiled module accepts the same
+# bytes-like inputs (bytearray, memoryview) as the pure Python source.
+
+cimport cython
+
+
+cpdef object encode_message(object message)
+
+cdef class WifiScanMessageProcessor:
+    cdef public str codec
+    cdef public int compression_level
+    cdef public int threads
+    cdef public object compress_bytes
+    cdef public object _z
+    cdef object _b64encode
+    cdef object _b64decode
+    cdef object _local
+    cdef object _encode_raw
+    cdef object _cache
+    cdef object _cache_lock
+
+    cpdef bytes compress_message(self, object message)
+
+    @cython.locals(size=Py_ssize_t, window_bits=int, deflated=bytes, trailer=bytes)
+    cpdef bytes _gzip_compress(self, object raw)
+
+    cpdef bytes _zstd_compress(self, object raw)
+
+    cpdef bytes decompress_bytes(self, object compressed_data)
+
+    cpdef str encode_base64(self, object data)
+
+    cpdef str _encode_only(self, object message)
+
+    cpdef tuple _compress_and_encode(self, object raw)
+
+    cpdef tuple _compress_and_encode_cached(self, object raw)
+
+    @cython.locals(compressed_data=bytes, encoded=bytes,
+                   original_size=Py_ssize_t, compressed_size=Py_ssize_t, encoded_size=Py_ssize_t,
+                   compression_ratio=double)
+    cpdef object process_message(self, object message, bint include_timestamp=*)
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+
+"""
+Optional native build of the WiFi scan message processor.
+
+By default this installs message_processor.py as a plain Python module. With
+ENABLE_SPEEDUPS=1 the module is compiled with Cython instead, using the
+declarations in message_processor.pxd to type the hot path:
+
+    ENABLE_SPEEDUPS=1 python3 setup.py build_ext --inplace
+
+The compiled module is picked up on import (e.g. by the Firehose producers);
+running `python3 message_processor.py` directly always executes the source.
+"""
+
+import os
+
+from setuptools import setup
+
+ext_modules = []
+if os.environ.get('ENABLE_SPEEDUPS') == '1':
+    from Cython.Build import cythonize
+    ext_modules = cythonize(['message_processor.py'], language_level=3)
+
+setup(
+    name='wifi-scan-message-processor',
+    py_modules=['message_processor'],
+    ext_modules=ext_modules,
+)
@@ -100,10 +100,10 @@ test_roundtrip() {
         return 1
     fi
     
-    # Decompress and verify
+    # Decompress and verify (dropping the "Decompressed message:" header line)
     python3 "${SCRIPT_DIR}/message_processor.py" \
         --decompress \
-        --base64 "${base64_data}" > "${temp_dir}/decompressed.json"
+        --base64 "${base64_data}" | tail -n +2 > "${temp_dir}/decompressed.json"
     
     # Verify content matches
     if python3 -c "
@@ -122,6 +122,221 @@ exit(0 if orig == decomp else 1)
     rm -rf "${temp_dir}"
 }
 
+# Test --decompress decodes every member of concatenated gzip records and rejects trailing garbage
+test_multi_member_decompress() {
+    log_info "Testing multi-member gzip decompression..."
+    
+    local base64_data
+    base64_data=$(python3 -c "
+import base64, gzip
+print(base64.b64encode(gzip.compress(b'{\"part\": ') + gzip.compress(b'\"one\"}')).decode('ascii'))
+    ")
+    
+    if python3 "${SCRIPT_DIR}/message_processor.py" \
+        --decompress \
+        --base64 "${base64_data}" | tail -n +2 | python3 -c "
+import json, sys
+exit(0 if json.load(sys.stdin) == {'part': 'one'} else 1)
+    "; then
+        log_success "Multi-member gzip decompression passed"
+    else
+        log_error "Multi-member gzip decompression failed"
+        return 1
+    fi
+    
+    base64_data=$(python3 -c "
+import base64, gzip
+print(base64.b64encode(gzip.compress(b'abc') + b'junk').decode('ascii'))
+    ")
+    
+    if python3 "${SCRIPT_DIR}/message_processor.py" \
+        --decompress \
+        --base64 "${base64_data}" > /dev/null 2>&1; then
+        log_error "Trailing garbage after a gzip member was not rejected"
+        return 1
+    fi
+    log_success "Trailing garbage after a gzip member rejected"
+}
+
+# Stream a file with --stream and check the output gunzips back to it;
+# the target compressed size exercises the base64 block boundary
+test_stream_case() {
+    local temp_dir="$1"
+    local label="$2"
+    local target_size="$3"
+    local input_file="${temp_dir}/stream_${label}.bin"
+    
+    # Incompressible input, trimmed until it compresses to exactly target_size bytes
+    python3 -c "
+import io, os, sys
+sys.path.insert(0, '${SCRIPT_DIR}')
+from message_processor import WifiScanMessageProcessor
+processor = WifiScanMessageProcessor()
+target = ${target_size}
+data = b''
+if target:
+    pool = os.urandom(target)
+    size = lambda n: processor.process_stream(io.BytesIO(pool[:n]), io.BytesIO()).compressed_size
+    low, high = 0, target
+    while low < high:
+        mid = (low + high) // 2
+        if size(mid) < target:
+            low = mid + 1
+        else:
+            high = mid
+    if size(low) != target:
+        sys.exit('no input compresses to %d bytes' % target)
+    data = pool[:low]
+open('${input_file}', 'wb').write(data)
+    "
+    
+    local stats
+    stats=$(python3 "${SCRIPT_DIR}/message_processor.py" \
+        --compress --stream \
+        --file "${input_file}" \
+        --output "${temp_dir}/stream_${label}.txt" \
+        --verbose)
+    
+    if [[ "${target_size}" -gt 0 ]] && ! grep -q "Compressed size: ${target_size} bytes" <<< "${stats}"; then
+        log_error "Stream test (${label}) did not compress to ${target_size} bytes"
+        return 1
+    fi
+    
+    if python3 -c "
+import base64, gzip
+encoded = open('${temp_dir}/stream_${label}.txt', 'rb').read()
+original = open('${input_file}', 'rb').read()
+exit(0 if gzip.decompress(base64.b64decode(encoded, validate=True)) == original else 1)
+    "; then
+        log_success "Stream round-trip passed (${label})"
+    else
+        log_error "Stream round-trip failed (${label})"
+        return 1
+    fi
+}
+
+# Test --stream on an empty file and around one base64 block (57 KiB) of compressed data
+test_stream_roundtrip() {
+    log_info "Testing streaming round-trips..."
+    
+    local temp_dir
+    temp_dir=$(mktemp -d)
+    
+    local block_size=$((57 * 1024))
+    test_stream_case "${temp_dir}" "empty" 0
+    test_stream_case "${temp_dir}" "one_block" "${block_size}"
+    test_stream_case "${temp_dir}" "block_plus_one" "$((block_size + 1))"
+    
+    rm -rf "${temp_dir}"
+}
+
+# Test --batch output decodes back to each input message, in order
+test_batch_roundtrip() {
+    log_info "Testing batch round-trip..."
+    
+    local temp_dir
+    temp_dir=$(mktemp -d)
+    
+    python3 -c "
+import json
+scan = json.load(open('${SAMPLE_DATA_FILE}'))
+json.dump([scan, {'index': 1}, 'plain text message', scan], open('${temp_dir}/batch.json', 'w'))
+    "
+    
+    python3 "${SCRIPT_DIR}/message_processor.py" \
+        --compress --batch \
+        --file "${temp_dir}/batch.json" \
+        --output "${temp_dir}/batch_compressed.json" > /dev/null
+    
+    if python3 -c "
+import base64, gzip, json
+messages = json.load(open('${temp_dir}/batch.json'))
+results = json.load(open('${temp_dir}/batch_compressed.json'))
+decoded = [gzip.decompress(base64.b64decode(r['encoded_data'])).decode('utf-8') for r in results]
+exit(0 if len(decoded) == len(messages) and all(
+    d == m if isinstance(m, str) else json.loads(d) == m for d, m in zip(decoded, messages)) else 1)
+    "; then
+        log_success "Batch round-trip passed"
+    else
+        log_error "Batch round-trip failed"
+        return 1
+    fi
+    
+    rm -rf "${temp_dir}"
+}
+
+# Test --codec zstd round-trip and truncated frame rejection (skipped when zstandard is not installed)
+test_zstd_roundtrip() {
+    log_info "Testing zstd round-trip..."
+    
+    if ! python3 -c "import zstandard" 2>/dev/null; then
+        log_warning "zstandard not installed, skipping zstd round-trip test"
+        return 0
+    fi
+    
+    local temp_dir
+    temp_dir=$(mktemp -d)
+    
+    python3 "${SCRIPT_DIR}/message_processor.py" \
+        --compress --codec zstd \
+        --file "${SAMPLE_DATA_FILE}" \
+        --output "${temp_dir}/compressed.json" > /dev/null
+    
+    if python3 -c "
+import base64, json, zstandard
+encoded = json.load(open('${temp_dir}/compressed.json'))['encoded_data']
+decoded = zstandard.ZstdDecompressor().decompress(base64.b64decode(encoded))
+exit(0 if json.loads(decoded) == json.load(open('${SAMPLE_DATA_FILE}')) else 1)
+    "; then
+        log_success "zstd round-trip passed"
+    else
+        log_error "zstd round-trip failed"
+        return 1
+    fi
+    
+    # A frame cut short by one byte must fail rather than decode to nothing
+    local truncated_data
+    truncated_data=$(python3 -c "
+import base64, json
+encoded = json.load(open('${temp_dir}/compressed.json'))['encoded_data']
+print(base64.b64encode(base64.b64decode(encoded)[:-1]).decode('ascii'))
+    ")
+    
+    if python3 "${SCRIPT_DIR}/message_processor.py" \
+        --decompress --codec zstd \
+        --base64 "${truncated_data}" > /dev/null 2>&1; then
+        log_error "Truncated zstd payload was not rejected"
+        return 1
+    fi
+    log_success "Truncated zstd payload rejected"
+    
+    rm -rf "${temp_dir}"
+}
+
+# Test a repeated message is served from the payload cache with identical output
+test_cache_hit() {
+    log_info "Testing payload cache..."
+    
+    if python3 -c "
+import json, sys
+sys.path.insert(0, '${SCRIPT_DIR}')
+from message_processor import WifiScanMessageProcessor
+processor = WifiScanMessageProcessor(enable_cache=True)
+scan = json.load(open('${SAMPLE_DATA_FILE}'))
+first = processor.process_message(scan)
+calls = []
+compress = processor.compress_bytes
+processor.compress_bytes = lambda raw: calls.append(raw) or compress(raw)
+second = processor.process_message(scan)
+exit(0 if not calls and second.encoded_data == first.encoded_data else 1)
+    "; then
+        log_success "Cache hit returned the cached payload without recompressing"
+    else
+        log_error "Cache test failed"
+        return 1
+    fi
+}
+
 # Display compression statistics
 show_compression_stats() {
     log_info "Compression Statistics Summary"
@@ -151,6 +366,16 @@ main() {
     echo
     test_roundtrip
     echo
+    test_multi_member_decompress
+    echo
+    test_stream_roundtrip
+    echo
+    test_batch_roundtrip
+    echo
+    test_zstd_roundtrip
+    echo
+    test_cache_hit
+    echo
     show_compression_stats
     
     echo